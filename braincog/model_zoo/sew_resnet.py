@@ -1,5 +1,10 @@
+import functools
+import math
+import os
+
 import torch
 import torch.nn as nn
+from torch.nn.utils.fusion import fuse_conv_bn_eval
 from copy import deepcopy
 
 try:
@@ -10,7 +15,7 @@ from braincog.base.node import *
 from braincog.model_zoo.base_module import *
 from braincog.datasets import is_dvs_data
 from timm.models import register_model
-__all__ = ['SEWResNet', 'sew_resnet18', 'sew_resnet34', 'sew_resnet50', 'sew_resnet101',
+__all__ = ['SEWResNet', 'MultiStep', 'build_sew_graph_runner', 'sew_resnet18', 'sew_resnet34', 'sew_resnet50', 'sew_resnet101',
            'sew_resnet152', 'sew_resnext50_32x4d', 'sew_resnext101_32x8d',
            'sew_wide_resnet50_2', 'sew_wide_resnet101_2']
 
@@ -28,16 +33,177 @@ model_urls = {
 
 # modified by https://github.com/pytorch/vision/blob/main/torchvision/models/resnet.py
 
-def sew_function(x: torch.Tensor, y: torch.Tensor, cnf:str):
-    if cnf == 'ADD':
-        return x + y
-    elif cnf == 'AND':
-        return x * y
-    elif cnf == 'IAND':
-        return x * (1. - y)
-    else:
-        raise NotImplementedError
+def _sew_iand(x: torch.Tensor, y: torch.Tensor) -> torch.Tensor:
+    return x * (1. - y)
+
+
+try:
+    # scripting lets the TorchScript fuser emit the sub and the mul as one
+    # elementwise kernel instead of materializing the (1 - y) temporary
+    _sew_iand = torch.jit.script(_sew_iand)
+except Exception:
+    pass
+
+
+# spike-element-wise merge functions, resolved once at block construction to
+# avoid a string compare on every forward of every block
+_SEW_FUNCTIONS = {
+    'ADD': torch.add,
+    'AND': torch.mul,
+    'IAND': _sew_iand,
+}
+
+
+
+def _fuse_block_conv_bn(block):
+    """
+    Fold the eval-mode BatchNorm layers of a residual block into the preceding convs,
+    so that each conv-bn pair becomes a single conv at inference time
+    :param block: a ``BasicBlock`` or ``Bottleneck`` instance
+    :return: None
+    """
+    for conv_name, bn_name in (('conv1', 'bn1'), ('conv2', 'bn2'), ('conv3', 'bn3')):
+        conv = getattr(block, conv_name, None)
+        bn = getattr(block, bn_name, None)
+        if isinstance(conv, nn.Conv2d) and isinstance(bn, nn.BatchNorm2d):
+            setattr(block, conv_name, fuse_conv_bn_eval(conv, bn))
+            setattr(block, bn_name, nn.Identity())
+    downsample = getattr(block, 'downsample', None)
+    if isinstance(downsample, nn.Sequential) and len(downsample) == 2 \
+            and isinstance(downsample[0], nn.Conv2d) and isinstance(downsample[1], nn.BatchNorm2d):
+        block.downsample = nn.Sequential(fuse_conv_bn_eval(downsample[0], downsample[1]))
+
+
+def _prune_conv_out(conv, mask):
+    if conv.groups != 1:
+        raise NotImplementedError('channel pruning does not support grouped convs')
+    pruned = nn.Conv2d(conv.in_channels, int(mask.sum()), conv.kernel_size,
+                       stride=conv.stride, padding=conv.padding,
+                       dilation=conv.dilation, bias=conv.bias is not None)
+    with torch.no_grad():
+        pruned.weight.copy_(conv.weight[mask])
+        if conv.bias is not None:
+            pruned.bias.copy_(conv.bias[mask])
+    return pruned
+
+
+def _prune_conv_in(conv, mask):
+    if conv.groups != 1:
+        raise NotImplementedError('channel pruning does not support grouped convs')
+    pruned = nn.Conv2d(int(mask.sum()), conv.out_channels, conv.kernel_size,
+                       stride=conv.stride, padding=conv.padding,
+                       dilation=conv.dilation, bias=conv.bias is not None)
+    with torch.no_grad():
+        pruned.weight.copy_(conv.weight[:, mask])
+        if conv.bias is not None:
+            pruned.bias.copy_(conv.bias)
+    return pruned
+
+
+def _prune_bn(bn, mask):
+    pruned = nn.BatchNorm2d(int(mask.sum()), eps=bn.eps, momentum=bn.momentum,
+                            affine=bn.affine,
+                            track_running_stats=bn.track_running_stats)
+    with torch.no_grad():
+        if bn.affine:
+            pruned.weight.copy_(bn.weight[mask])
+            pruned.bias.copy_(bn.bias[mask])
+        if bn.track_running_stats:
+            pruned.running_mean.copy_(bn.running_mean[mask])
+            pruned.running_var.copy_(bn.running_var[mask])
+    return pruned
+
+
+def _prune_zero_spike_channels(model, prune_profile):
+    """
+    Structured channel pruning driven by a spike-rate profile: channels whose
+    spike rate collapsed to zero during training are dropped, shrinking the
+    convs on both sides of the pruned activation. Only channels internal to a
+    residual block can be pruned — block outputs feed the SEW merge, whose
+    width has to keep matching the shortcut — so masks address ``conv1`` of
+    any block and ``conv2`` of a ``Bottleneck``
+    :param model: a SEW model, built and (if requested) pretrained-loaded
+    :param prune_profile: dict mapping a conv name from ``named_modules``
+        (e.g. ``'layer1.0.conv1'``) to a boolean keep-mask over its output
+        channels
+    :return: the pruned model
+    """
+    for name, mask in prune_profile.items():
+        block_name, _, conv_name = name.rpartition('.')
+        block = model.get_submodule(block_name)
+        internal = ('conv1', 'conv2') if isinstance(block, Bottleneck) else ('conv1',)
+        if not isinstance(block, (BasicBlock, Bottleneck)) or conv_name not in internal:
+            raise ValueError(
+                '{} is not a block-internal conv; block outputs cannot be '
+                'pruned without breaking the SEW residual merge'.format(name))
+        mask = mask.to(torch.bool)
+        conv = getattr(block, conv_name)
+        if mask.numel() != conv.out_channels:
+            raise ValueError('mask for {} has {} entries, conv has {} output '
+                             'channels'.format(name, mask.numel(), conv.out_channels))
+        bn_name = conv_name.replace('conv', 'bn')
+        next_name = 'conv{}'.format(int(conv_name[-1]) + 1)
+        setattr(block, conv_name, _prune_conv_out(conv, mask))
+        setattr(block, bn_name, _prune_bn(getattr(block, bn_name), mask))
+        setattr(block, next_name, _prune_conv_in(getattr(block, next_name), mask))
+    return model
+
 
+def _quantize_model(model, quantize):
+    """
+    Post-construction weight quantization for inference builds
+    :param model: the constructed model
+    :param quantize: ``'none'``, ``'int8'`` or ``'fp8'``. ``'int8'`` rounds
+        the conv weights onto a per-channel int8 grid (weight-only, the convs
+        still run in the activation dtype) and dynamically quantizes the
+        Linear head; ``'fp8'`` rounds the conv/linear weights onto the
+        float8_e4m3fn grid (weight-only as well)
+    :return: the quantized model
+    """
+    if quantize in (None, 'none'):
+        return model
+    if quantize == 'int8':
+        # dynamic quantization has no Conv2d mapping, so the convs get a
+        # weight-only per-channel int8 round-trip (like the fp8 branch below)
+        # and only the Linear head is dynamically quantized for real
+        with torch.no_grad():
+            for m in model.modules():
+                if isinstance(m, nn.Conv2d):
+                    w = m.weight
+                    scale = w.abs().amax(dim=(1, 2, 3), keepdim=True)
+                    scale = scale.clamp_(min=1e-8).div_(127.)
+                    w.copy_(torch.round(w / scale).clamp_(-127., 127.).mul_(scale))
+        return torch.ao.quantization.quantize_dynamic(
+            model, {nn.Linear}, dtype=torch.qint8)
+    if quantize == 'fp8':
+        if not hasattr(torch, 'float8_e4m3fn'):
+            raise NotImplementedError('fp8 quantization needs a PyTorch build with float8 support')
+        with torch.no_grad():
+            for m in model.modules():
+                if isinstance(m, (nn.Conv2d, nn.Linear)):
+                    m.weight.copy_(m.weight.to(torch.float8_e4m3fn).to(m.weight.dtype))
+        return model
+    raise NotImplementedError(quantize)
+
+
+def _maybe_compile(model, compile_model=False, mode='reduce-overhead'):
+    """
+    Wrap a model with ``torch.compile`` when requested, letting TorchInductor fuse
+    the conv-bn-node-sew pointwise chains of each residual block
+    :param model: the constructed model
+    :param compile_model: whether to compile, default ``False``
+    :param mode: the ``torch.compile`` mode, default ``'reduce-overhead'``
+    :return: the (possibly compiled) model
+    """
+    if compile_model:
+        if hasattr(torch, 'compile'):
+            # dynamic=False keeps a single static-shape graph so reduce-overhead
+            # mode can capture CUDA graphs for the T-step unroll
+            model = torch.compile(model, mode=mode, fullgraph=False, dynamic=False)
+        elif hasattr(model, 'script_layers'):
+            # older PyTorch without Inductor: fall back to the TorchScript fuser
+            model = model.script_layers()
+    return model
 
 
 def conv3x3(in_planes, out_planes, stride=1, groups=1, dilation=1):
@@ -70,14 +236,18 @@ class BasicBlock(nn.Module):
         self.conv2 = conv3x3(planes, planes)
         self.bn2 = norm_layer(planes)
         self.node2 = node()
-        self.downsample = downsample
-        if downsample is not None:
-            self.downsample_sn = node()
+        # always present so forward carries no data-dependent Python branch,
+        # which also keeps the block a single static graph for JIT/Inductor
+        self.downsample = downsample if downsample is not None else nn.Identity()
+        self.downsample_sn = node() if downsample is not None else nn.Identity()
         self.stride = stride
         self.cnf = cnf
+        if cnf not in _SEW_FUNCTIONS:
+            raise NotImplementedError
+        self.sew_fn = _SEW_FUNCTIONS[cnf]
 
     def forward(self, x):
-        identity = x
+        identity = self.downsample_sn(self.downsample(x))
 
         out = self.conv1(x)
         out = self.bn1(out)
@@ -87,10 +257,7 @@ class BasicBlock(nn.Module):
         out = self.bn2(out)
         out = self.node2(out)
 
-        if self.downsample is not None:
-            identity = self.downsample_sn(self.downsample(x))
-
-        out = sew_function(identity, out, self.cnf)
+        out = self.sew_fn(identity, out)
 
         return out
 
@@ -122,14 +289,18 @@ class Bottleneck(nn.Module):
         self.conv3 = conv1x1(width, planes * self.expansion)
         self.bn3 = norm_layer(planes * self.expansion)
         self.node3 = node()
-        self.downsample = downsample
-        if downsample is not None:
-            self.downsample_sn = node()
+        # always present so forward carries no data-dependent Python branch,
+        # which also keeps the block a single static graph for JIT/Inductor
+        self.downsample = downsample if downsample is not None else nn.Identity()
+        self.downsample_sn = node() if downsample is not None else nn.Identity()
         self.stride = stride
         self.cnf = cnf
+        if cnf not in _SEW_FUNCTIONS:
+            raise NotImplementedError
+        self.sew_fn = _SEW_FUNCTIONS[cnf]
 
     def forward(self, x):
-        identity = x
+        identity = self.downsample_sn(self.downsample(x))
 
         out = self.conv1(x)
         out = self.bn1(out)
@@ -143,10 +314,7 @@ class Bottleneck(nn.Module):
         out = self.bn3(out)
         out = self.node3(out)
 
-        if self.downsample is not None:
-            identity = self.downsample_sn(self.downsample(x))
-
-        out = sew_function(out, identity, self.cnf)
+        out = self.sew_fn(out, identity)
 
         return out
 
@@ -154,11 +322,63 @@ class Bottleneck(nn.Module):
         return super().extra_repr() + f'cnf={self.cnf}'
 
 
-class SEWResNet(BaseModule):
-    def __init__(self, block, layers, num_classes=1000, step=8,encode_type="direct",zero_init_residual=False,
+class _CudnnConvReLU(nn.Module):
+    """
+    Conv + bias + ReLU dispatched as a single cuDNN kernel
+    (``aten::cudnn_convolution_relu``), used at inference after BN folding
+    when the following node is ReLU-like
+    :param conv: the (already BN-folded) convolution, must carry a bias
+    """
+
+    def __init__(self, conv):
+        super().__init__()
+        self.conv = conv
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        return torch.ops.aten.cudnn_convolution_relu(
+            x, self.conv.weight, self.conv.bias,
+            self.conv.stride, self.conv.padding, self.conv.dilation, self.conv.groups)
+
+
+class Stem(nn.Module):
+    """
+    The stem conv-bn-node(-pool) sequence packaged as a single module, so the
+    network entry is one call operating on the largest activation of the
+    network and can be scripted/fused as a unit
+    :param conv: the stem convolution
+    :param bn: the stem norm layer
+    :param node: the stem spiking node
+    :param pool: optional pooling layer, ``None`` becomes ``nn.Identity``
+    """
+
+    def __init__(self, conv, bn, node, pool=None):
+        super().__init__()
+        self.conv = conv
+        self.bn = bn
+        self.node = node
+        self.pool = pool if pool is not None else nn.Identity()
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        return self.pool(self.node(self.bn(self.conv(x))))
+
+
+class _SEWResNetBase(BaseModule):
+    """
+    Shared logic of the SEW-ResNet variants: option parsing, spiking-node
+    factory, residual-layer builder, weight init and Conv-BN fusion.
+    Subclasses build their own stem/head and define ``_forward_impl`` and
+    ``_forward_once``.
+
+    With ``channels_last=True`` the weights are kept in NHWC and incoming
+    activations are converted before the stem; callers feeding the model
+    directly (``once=True``) should pass channels_last-contiguous inputs to
+    avoid the conversion copy.
+    """
+
+    def __init__(self, num_classes=1000, step=8, encode_type="direct",
                  groups=1, width_per_group=64, replace_stride_with_dilation=None,
-                 norm_layer=None, cnf: str = None,   *args,**kwargs):
-        super().__init__(            
+                 norm_layer=None, *args, **kwargs):
+        super().__init__(
             step,
             encode_type,
             *args,
@@ -174,11 +394,17 @@ class SEWResNet(BaseModule):
             self.node = partial(self.node, **kwargs, step=step)
         self.once=kwargs["once"] if "once"in kwargs else False
         self.sum_output=kwargs["sum_output"] if "sum_output"in kwargs else True
+        self.stateless_backbone=kwargs["stateless_backbone"] if "stateless_backbone"in kwargs else False
+        self.channels_last=kwargs["channels_last"] if "channels_last"in kwargs else False
+        self.amp_dtype=kwargs["amp_dtype"] if "amp_dtype"in kwargs else None
+        if isinstance(self.amp_dtype, str):
+            # config-driven callers pass 'float16'/'bfloat16' through the
+            # factory kwargs; resolve to the torch dtype here
+            self.amp_dtype = getattr(torch, self.amp_dtype)
         self.dataset = kwargs['dataset']
-        if not is_dvs_data(self.dataset):
-            init_channel = 3
-        else:
-            init_channel = 2
+        # computed once here, the stem builders and forward paths reuse it
+        self.is_dvs = is_dvs_data(self.dataset)
+        self.init_channel = 2 if self.is_dvs else 3
         self.inplanes = 64
         self.dilation = 1
         if replace_stride_with_dilation is None:
@@ -188,32 +414,36 @@ class SEWResNet(BaseModule):
         if len(replace_stride_with_dilation) != 3:
             raise ValueError("replace_stride_with_dilation should be None "
                              "or a 3-element tuple, got {}".format(replace_stride_with_dilation))
+        self.replace_stride_with_dilation = replace_stride_with_dilation
         self.groups = groups
         self.base_width = width_per_group
 
- 
-
-        self.conv1 = nn.Conv2d(init_channel, self.inplanes, kernel_size=7, stride=2, padding=3,
-                               bias=False)
-        self.bn1 = norm_layer(self.inplanes)
-        self.node1 = self.node()
-        self.maxpool = nn.MaxPool2d(kernel_size=3, stride=2, padding=1)
-        self.layer1 = self._make_layer(block, 64, layers[0], cnf=cnf, node=self.node, **kwargs)
-        self.layer2 = self._make_layer(block, 128, layers[1], stride=2,
-                                       dilate=replace_stride_with_dilation[0], cnf=cnf, node=self.node, **kwargs)
-        self.layer3 = self._make_layer(block, 256, layers[2], stride=2,
-                                       dilate=replace_stride_with_dilation[1], cnf=cnf, node=self.node, **kwargs)
-        self.layer4 = self._make_layer(block, 512, layers[3], stride=2,
-                                       dilate=replace_stride_with_dilation[2], cnf=cnf, node=self.node, **kwargs)
-        self.avgpool = nn.AdaptiveAvgPool2d((1, 1))
-        self.fc = nn.Linear(512 * block.expansion, num_classes)
+    def _run_layer(self, layer, x):
+        for blk in layer:
+            x = blk(x)
+        return x
 
+    def _init_weights(self, zero_init_residual=False):
+        conv_weights, bn_weights, bn_biases = [], [], []
         for m in self.modules():
             if isinstance(m, nn.Conv2d):
-                nn.init.kaiming_normal_(m.weight, mode='fan_out', nonlinearity='relu')
+                conv_weights.append(m.weight)
             elif isinstance(m, (nn.BatchNorm2d, nn.GroupNorm)):
-                nn.init.constant_(m.weight, 1)
-                nn.init.constant_(m.bias, 0)
+                bn_weights.append(m.weight)
+                bn_biases.append(m.bias)
+
+        # Kaiming-normal with mode='fan_out' and relu gain: fill standard
+        # normals per tensor, then scale and fill whole parameter lists with
+        # fused _foreach_ calls instead of one Python->ATen round trip per layer.
+        with torch.no_grad():
+            stds = [math.sqrt(2.0 / (w.shape[0] * w[0][0].numel())) for w in conv_weights]
+            for w in conv_weights:
+                w.normal_()
+            torch._foreach_mul_(conv_weights, stds)
+            if len(bn_weights) > 0:
+                torch._foreach_zero_(bn_weights)
+                torch._foreach_add_(bn_weights, 1.0)
+                torch._foreach_zero_(bn_biases)
 
         # Zero-initialize the last BN in each residual branch,
         # so that the residual branch starts with zeros, and each residual block behaves like an identity.
@@ -225,8 +455,15 @@ class SEWResNet(BaseModule):
                 elif isinstance(m, BasicBlock):
                     nn.init.constant_(m.bn2.weight, 0)
 
+        if self.channels_last:
+            self.to(memory_format=torch.channels_last)
+
     def _make_layer(self, block, planes, blocks, stride=1, dilate=False, cnf: str=None, node: callable = None, **kwargs):
         norm_layer = self._norm_layer
+        if node is None:
+            # reuse the node factory partial built once in __init__ instead of
+            # re-binding it through every _make_layer call
+            node = self.node
         downsample = None
         previous_dilation = self.dilation
         if dilate:
@@ -247,34 +484,148 @@ class SEWResNet(BaseModule):
                                 base_width=self.base_width, dilation=self.dilation,
                                 norm_layer=norm_layer, cnf=cnf, node=node, **kwargs))
 
-        return nn.Sequential(*layers)
+        # a ModuleList keeps the residual structure visible to graph transforms
+        # (per-block scripting/compile decisions) instead of hiding it behind
+        # one opaque Sequential call; indices match the old Sequential keys
+        return nn.ModuleList(layers)
+
+    def forward(self, x):
+        if self.amp_dtype is not None:
+            # fp16 training still needs the usual GradScaler loop on the caller side
+            # (scaler.scale(loss).backward(); scaler.step(opt); scaler.update());
+            # bf16 runs without a scaler.
+            with torch.autocast(device_type=x.device.type, dtype=self.amp_dtype):
+                if self.once: return self._forward_once(x)
+                return self._forward_impl(x)
+        if self.once:return self._forward_once(x)
+        return self._forward_impl(x)
+
+    def script_layers(self):
+        """
+        Script the residual stages with ``torch.jit.script`` so the TorchScript
+        fuser can merge the BN-node-residual pointwise tails of each block,
+        as a fallback on builds where TorchInductor is not available
+        :return: the model itself
+        :rtype: torch.nn.Module
+        """
+        for name in ('stem', 'layer1', 'layer2', 'layer3', 'layer4'):
+            layer = getattr(self, name, None)
+            if layer is None:
+                continue
+            try:
+                if isinstance(layer, nn.ModuleList):
+                    setattr(self, name, nn.ModuleList([torch.jit.script(blk) for blk in layer]))
+                else:
+                    setattr(self, name, torch.jit.script(layer))
+            except Exception:
+                # nodes with Python-level state generally do not script; keep
+                # the eager layers rather than failing model construction
+                break
+        return self
+
+    def prepare_fast_inference(self):
+        """
+        Inference-only rewrite: folds BN into the convs (``fuse_model``) and,
+        where a folded conv is followed by a ReLU-like node, dispatches the
+        pair through cuDNN's fused conv+bias+activation kernel. Feature-map
+        recording of the replaced nodes is dropped, so this is for pure
+        inference on CUDA only
+        :return: the model itself
+        :rtype: torch.nn.Module
+        """
+        self.fuse_model()
+        if not (torch.cuda.is_available() and hasattr(torch.ops.aten, 'cudnn_convolution_relu')):
+            return self
+        relu_like = (ReLUNode, nn.ReLU)
+        if isinstance(self.stem, Stem) and isinstance(self.stem.bn, nn.Identity) \
+                and isinstance(self.stem.node, relu_like) and self.stem.conv.bias is not None:
+            self.stem.conv = _CudnnConvReLU(self.stem.conv)
+            self.stem.node = nn.Identity()
+        for m in self.modules():
+            if isinstance(m, (BasicBlock, Bottleneck)):
+                for conv_name, bn_name, node_name in (('conv1', 'bn1', 'node1'),
+                                                      ('conv2', 'bn2', 'node2'),
+                                                      ('conv3', 'bn3', 'node3')):
+                    conv = getattr(m, conv_name, None)
+                    bn = getattr(m, bn_name, None)
+                    node = getattr(m, node_name, None)
+                    if isinstance(conv, nn.Conv2d) and isinstance(bn, nn.Identity) \
+                            and isinstance(node, relu_like) and conv.bias is not None:
+                        setattr(m, conv_name, _CudnnConvReLU(conv))
+                        setattr(m, node_name, nn.Identity())
+        return self
+
+    def fuse_model(self):
+        """
+        Fuse all Conv-BN pairs into single convs for inference, the model must be
+        in eval mode because the fusion relies on the BN running statistics
+        :return: the model itself
+        :rtype: torch.nn.Module
+        """
+        assert not self.training, 'fuse_model() requires the model in eval mode'
+        if isinstance(self.stem, Stem) and isinstance(self.stem.bn, nn.BatchNorm2d):
+            self.stem.conv = fuse_conv_bn_eval(self.stem.conv, self.stem.bn)
+            self.stem.bn = nn.Identity()
+        for m in self.modules():
+            if isinstance(m, (BasicBlock, Bottleneck)):
+                _fuse_block_conv_bn(m)
+        return self
+
+
+class SEWResNet(_SEWResNetBase):
+    def __init__(self, block, layers, num_classes=1000, step=8,encode_type="direct",zero_init_residual=False,
+                 groups=1, width_per_group=64, replace_stride_with_dilation=None,
+                 norm_layer=None, cnf: str = None,   *args,**kwargs):
+        super().__init__(num_classes, step, encode_type, groups, width_per_group,
+                         replace_stride_with_dilation, norm_layer, *args, **kwargs)
+        self.stem = Stem(
+            nn.Conv2d(self.init_channel, self.inplanes, kernel_size=7, stride=2, padding=3,
+                      bias=False),
+            self._norm_layer(self.inplanes),
+            self.node(),
+            nn.MaxPool2d(kernel_size=3, stride=2, padding=1))
+        self.layer1 = self._make_layer(block, 64, layers[0], cnf=cnf, **kwargs)
+        self.layer2 = self._make_layer(block, 128, layers[1], stride=2,
+                                       dilate=self.replace_stride_with_dilation[0], cnf=cnf, **kwargs)
+        self.layer3 = self._make_layer(block, 256, layers[2], stride=2,
+                                       dilate=self.replace_stride_with_dilation[1], cnf=cnf, **kwargs)
+        self.layer4 = self._make_layer(block, 512, layers[3], stride=2,
+                                       dilate=self.replace_stride_with_dilation[2], cnf=cnf, **kwargs)
+        self.avgpool = nn.AdaptiveAvgPool2d((1, 1))
+        self.fc = nn.Linear(512 * block.expansion, num_classes)
+
+        self._init_weights(zero_init_residual)
 
     def _forward_impl(self, inputs):
         # See note [TorchScript super()]
         inputs = self.encoder(inputs)
         self.reset()
 
-        if self.layer_by_layer:
+        if self.stateless_backbone and not self.layer_by_layer:
+            # No module keeps cross-timestep state, so fold the time axis into
+            # batch and run the whole window as a single forward.
+            inputs = rearrange(inputs, 't b c h w -> (t b) c h w')
 
-            x = self.conv1(inputs)
-            
-            x = self.bn1(x)
-            x = self.node1(x)
-            x = self.maxpool(x)
+        if self.layer_by_layer or self.stateless_backbone:
 
-            x = self.layer1(x)
-            x = self.layer2(x)
-            x = self.layer3(x)
-            x = self.layer4(x)
+            if self.channels_last:
+                inputs = inputs.contiguous(memory_format=torch.channels_last)
+            x = self.stem(inputs)
 
-            x = self.avgpool(x)
+            x = self._run_layer(self.layer1, x)
+            x = self._run_layer(self.layer2, x)
+            x = self._run_layer(self.layer3, x)
+            x = self._run_layer(self.layer4, x)
 
-            x = torch.flatten(x, 1)
+            # spatial mean == 1x1 adaptive avg-pool + flatten, in one kernel
+            x = x.mean(dim=(-2, -1))
 
             
             x = self.fc(x)
             
-            x = rearrange(x, '(t b) c -> t b c', t=self.step)
+            # equivalent to rearrange('(t b) c -> t b c') on the row-major fc
+            # output, without the per-call pattern parse or a contiguous copy
+            x = x.view(self.step, -1, x.size(-1))
             #print(x)
             if self.sum_output:x=x.mean(0)
  
@@ -283,170 +634,107 @@ class SEWResNet(BaseModule):
 
         else:
             outputs=[]
+            acc = None
             for t in range(self.step):
                 x = inputs[t]
-                x = self.conv1(x)
-                x = self.bn1(x)
-                x = self.node1(x)
-                x = self.maxpool(x)
-
-                x = self.layer1(x)
-                x = self.layer2(x)
-                x = self.layer3(x)
-                x = self.layer4(x)
-
-                x = self.avgpool(x)
-                x = torch.flatten(x, 1)
+                if self.channels_last:
+                    x = x.contiguous(memory_format=torch.channels_last)
+                x = self.stem(x)
+
+                x = self._run_layer(self.layer1, x)
+                x = self._run_layer(self.layer2, x)
+                x = self._run_layer(self.layer3, x)
+                x = self._run_layer(self.layer4, x)
+
+                x = x.mean(dim=(-2, -1))
                 
                 
                 x = self.fc(x)
 
-                outputs.append(x)
-            if not self.sum_output:return outputs
-            return sum(outputs) / len(outputs)
+                if self.sum_output:
+                    # running in-place accumulation keeps the tail at O(B x C)
+                    # memory instead of retaining all T output tensors
+                    acc = x if acc is None else acc.add_(x)
+                else:
+                    outputs.append(x)
+            if not self.sum_output:
+                # stacked (t, b, c) tensor: scriptable, matches the
+                # layer-by-layer branch, and avoids Python list returns
+                return torch.stack(outputs, 0)
+            return acc.div_(self.step)
 
     def _forward_once(self,x):
         # inputs = self.encoder(inputs)
         # x = inputs[t]
-        x = self.conv1(x)
-        x = self.bn1(x)
-        x = self.node1(x)
-        x = self.maxpool(x)
-
-        x = self.layer1(x)
-        x = self.layer2(x)
-        x = self.layer3(x)
-        x = self.layer4(x)
-
-        x = self.avgpool(x)
-        x = torch.flatten(x, 1)
+        if self.channels_last:
+            x = x.contiguous(memory_format=torch.channels_last)
+        x = self.stem(x)
+
+        x = self._run_layer(self.layer1, x)
+        x = self._run_layer(self.layer2, x)
+        x = self._run_layer(self.layer3, x)
+        x = self._run_layer(self.layer4, x)
+
+        x = x.mean(dim=(-2, -1))
         
         
         x = self.fc(x)
         return x
-    def forward(self, x):
-        if self.once:return self._forward_once(x)
-        return self._forward_impl(x)
 
-class SEWResNet19(BaseModule):
+
+class SEWResNet19(_SEWResNetBase):
     def __init__(self, block, layers, num_classes=1000, step=8,encode_type="direct",zero_init_residual=False,
                  groups=1, width_per_group=64, replace_stride_with_dilation=None,
                  norm_layer=None, cnf: str = None,   *args,**kwargs):
-        super().__init__(            
-            step,
-            encode_type,
-            *args,
-            **kwargs
-        )
-        if norm_layer is None:
-            norm_layer = nn.BatchNorm2d
-        self._norm_layer = norm_layer
-        self.num_classes = num_classes
-
-        self.node = kwargs['node_type']
-        if issubclass(self.node, BaseNode):
-            self.node = partial(self.node, **kwargs, step=step)
-        self.once=kwargs["once"] if "once"in kwargs else False
-        self.sum_output=kwargs["sum_output"] if "sum_output"in kwargs else True
-        self.dataset = kwargs['dataset']
-        if not is_dvs_data(self.dataset):
-            init_channel = 3
-        else:
-            init_channel = 2
-        self.inplanes = 64
-        self.dilation = 1
-        if replace_stride_with_dilation is None:
-            # each element in the tuple indicates if we should replace
-            # the 2x2 stride with a dilated convolution instead
-            replace_stride_with_dilation = [False, False, False]
-        if len(replace_stride_with_dilation) != 3:
-            raise ValueError("replace_stride_with_dilation should be None "
-                             "or a 3-element tuple, got {}".format(replace_stride_with_dilation))
-        self.groups = groups
-        self.base_width = width_per_group
-
- 
-
-        self.conv1 = nn.Conv2d(init_channel, self.inplanes, kernel_size=3, stride=1, padding=1,
-                               bias=False)
-        self.bn1 = norm_layer(self.inplanes)
-        self.node1 = self.node() 
-        self.layer1 = self._make_layer(block, 128, layers[0], cnf=cnf, node=self.node, **kwargs)
+        super().__init__(num_classes, step, encode_type, groups, width_per_group,
+                         replace_stride_with_dilation, norm_layer, *args, **kwargs)
+        self.stem = Stem(
+            nn.Conv2d(self.init_channel, self.inplanes, kernel_size=3, stride=1, padding=1,
+                      bias=False),
+            self._norm_layer(self.inplanes),
+            self.node())
+        self.layer1 = self._make_layer(block, 128, layers[0], cnf=cnf, **kwargs)
         self.layer2 = self._make_layer(block, 256, layers[1], stride=2,
-                                       dilate=replace_stride_with_dilation[0], cnf=cnf, node=self.node, **kwargs)
+                                       dilate=self.replace_stride_with_dilation[0], cnf=cnf, **kwargs)
         self.layer3 = self._make_layer(block, 512, layers[2], stride=2,
-                                       dilate=replace_stride_with_dilation[1], cnf=cnf, node=self.node, **kwargs) 
+                                       dilate=self.replace_stride_with_dilation[1], cnf=cnf, **kwargs) 
         self.avgpool = nn.AdaptiveAvgPool2d((1, 1))
         self.fc1 = nn.Linear(512 * block.expansion, 256)
         self.fc2 = nn.Linear(256, num_classes)
          
         self.node2 = self.node()
-        for m in self.modules():
-            if isinstance(m, nn.Conv2d):
-                nn.init.kaiming_normal_(m.weight, mode='fan_out', nonlinearity='relu')
-            elif isinstance(m, (nn.BatchNorm2d, nn.GroupNorm)):
-                nn.init.constant_(m.weight, 1)
-                nn.init.constant_(m.bias, 0)
-
-        # Zero-initialize the last BN in each residual branch,
-        # so that the residual branch starts with zeros, and each residual block behaves like an identity.
-        # This improves the model by 0.2~0.3% according to https://arxiv.org/abs/1706.02677
-        if zero_init_residual:
-            for m in self.modules():
-                if isinstance(m, Bottleneck):
-                    nn.init.constant_(m.bn3.weight, 0)
-                elif isinstance(m, BasicBlock):
-                    nn.init.constant_(m.bn2.weight, 0)
-
-    def _make_layer(self, block, planes, blocks, stride=1, dilate=False, cnf: str=None, node: callable = None, **kwargs):
-        norm_layer = self._norm_layer
-        downsample = None
-        previous_dilation = self.dilation
-        if dilate:
-            self.dilation *= stride
-            stride = 1
-        if stride != 1 or self.inplanes != planes * block.expansion:
-            downsample = nn.Sequential(
-                conv1x1(self.inplanes, planes * block.expansion, stride),
-                norm_layer(planes * block.expansion),
-            )
-
-        layers = []
-        layers.append(block(self.inplanes, planes, stride, downsample, self.groups,
-                            self.base_width, previous_dilation, norm_layer, cnf, node, **kwargs))
-        self.inplanes = planes * block.expansion
-        for _ in range(1, blocks):
-            layers.append(block(self.inplanes, planes, groups=self.groups,
-                                base_width=self.base_width, dilation=self.dilation,
-                                norm_layer=norm_layer, cnf=cnf, node=node, **kwargs))
-
-        return nn.Sequential(*layers)
+        self._init_weights(zero_init_residual)
 
     def _forward_impl(self, inputs):
         # See note [TorchScript super()]
         inputs = self.encoder(inputs)
         self.reset()
 
-        if self.layer_by_layer:
+        if self.stateless_backbone and not self.layer_by_layer:
+            # No module keeps cross-timestep state, so fold the time axis into
+            # batch and run the whole window as a single forward.
+            inputs = rearrange(inputs, 't b c h w -> (t b) c h w')
 
-            x = self.conv1(inputs)
-            
-            x = self.bn1(x)
-            x = self.node1(x) 
+        if self.layer_by_layer or self.stateless_backbone:
 
-            x = self.layer1(x)
-            x = self.layer2(x)
-            x = self.layer3(x) 
+            if self.channels_last:
+                inputs = inputs.contiguous(memory_format=torch.channels_last)
+            x = self.stem(inputs)
 
-            x = self.avgpool(x)
+            x = self._run_layer(self.layer1, x)
+            x = self._run_layer(self.layer2, x)
+            x = self._run_layer(self.layer3, x) 
 
-            x = torch.flatten(x, 1)
+            # spatial mean == 1x1 adaptive avg-pool + flatten, in one kernel
+            x = x.mean(dim=(-2, -1))
 
             x = self.fc1(x)
             x = self.node2(x)
             x = self.fc2(x)
             
-            x = rearrange(x, '(t b) c -> t b c', t=self.step)
+            # equivalent to rearrange('(t b) c -> t b c') on the row-major fc
+            # output, without the per-call pattern parse or a contiguous copy
+            x = x.view(self.step, -1, x.size(-1))
             #print(x)
             if self.sum_output:x=x.mean(0)
  
@@ -455,168 +743,106 @@ class SEWResNet19(BaseModule):
 
         else:
             outputs=[]
+            acc = None
             for t in range(self.step):
                 x = inputs[t]
-                x = self.conv1(x)
-                x = self.bn1(x)
-                x = self.node1(x)
+                if self.channels_last:
+                    x = x.contiguous(memory_format=torch.channels_last)
+                x = self.stem(x)
 
-                x = self.layer1(x)
-                x = self.layer2(x)
-                x = self.layer3(x)
+                x = self._run_layer(self.layer1, x)
+                x = self._run_layer(self.layer2, x)
+                x = self._run_layer(self.layer3, x)
 
-                x = self.avgpool(x)
-                x = torch.flatten(x, 1)
+                x = x.mean(dim=(-2, -1))
                 
                 x = self.fc1(x)
                 x = self.node2(x)
                 x = self.fc2(x)
 
-                outputs.append(x)
-            if not self.sum_output:return outputs
-            return sum(outputs) / len(outputs)
+                if self.sum_output:
+                    # running in-place accumulation keeps the tail at O(B x C)
+                    # memory instead of retaining all T output tensors
+                    acc = x if acc is None else acc.add_(x)
+                else:
+                    outputs.append(x)
+            if not self.sum_output:
+                # stacked (t, b, c) tensor: scriptable, matches the
+                # layer-by-layer branch, and avoids Python list returns
+                return torch.stack(outputs, 0)
+            return acc.div_(self.step)
 
     def _forward_once(self,x):
         # inputs = self.encoder(inputs)
         # x = inputs[t]
-        x = self.conv1(x)
-        x = self.bn1(x)
-        x = self.node1(x)
-        x = self.maxpool(x)
-
-        x = self.layer1(x)
-        x = self.layer2(x)
-        x = self.layer3(x)
-        x = self.layer4(x)
-
-        x = self.avgpool(x)
-        x = torch.flatten(x, 1)
+        if self.channels_last:
+            x = x.contiguous(memory_format=torch.channels_last)
+        x = self.stem(x)
+
+        x = self._run_layer(self.layer1, x)
+        x = self._run_layer(self.layer2, x)
+        x = self._run_layer(self.layer3, x)
+        x = self._run_layer(self.layer4, x)
+
+        x = x.mean(dim=(-2, -1))
         
         
         x = self.fc(x)
         return x
-    def forward(self, x):
-        if self.once:return self._forward_once(x)
-        return self._forward_impl(x)
- 
-class SEWResNetCifar(BaseModule):
+
+
+class SEWResNetCifar(_SEWResNetBase):
     def __init__(self, block, layers, num_classes=1000, step=8,encode_type="direct",zero_init_residual=False,
                  groups=1, width_per_group=64, replace_stride_with_dilation=None,
                  norm_layer=None, cnf: str = None,   *args,**kwargs):
-        super().__init__(            
-            step,
-            encode_type,
-            *args,
-            **kwargs
-        )
-        if norm_layer is None:
-            norm_layer = nn.BatchNorm2d
-        self._norm_layer = norm_layer
-        self.num_classes = num_classes
-
-        self.node = kwargs['node_type']
-        if issubclass(self.node, BaseNode):
-            self.node = partial(self.node, **kwargs, step=step)
-        self.once=kwargs["once"] if "once"in kwargs else False
-        self.sum_output=kwargs["sum_output"] if "sum_output"in kwargs else True
-        self.dataset = kwargs['dataset']
-        if not is_dvs_data(self.dataset):
-            init_channel = 3
-        else:
-            init_channel = 2
-        self.inplanes = 64
-        self.dilation = 1
-        if replace_stride_with_dilation is None:
-            # each element in the tuple indicates if we should replace
-            # the 2x2 stride with a dilated convolution instead
-            replace_stride_with_dilation = [False, False, False]
-        if len(replace_stride_with_dilation) != 3:
-            raise ValueError("replace_stride_with_dilation should be None "
-                             "or a 3-element tuple, got {}".format(replace_stride_with_dilation))
-        self.groups = groups
-        self.base_width = width_per_group
-
- 
-
-        self.conv1 = nn.Conv2d(init_channel, self.inplanes, kernel_size=3, stride=1, padding=1,
-                               bias=False)
-        self.bn1 = norm_layer(self.inplanes)
-        self.node1 = self.node()
+        super().__init__(num_classes, step, encode_type, groups, width_per_group,
+                         replace_stride_with_dilation, norm_layer, *args, **kwargs)
+        self.stem = Stem(
+            nn.Conv2d(self.init_channel, self.inplanes, kernel_size=3, stride=1, padding=1,
+                      bias=False),
+            self._norm_layer(self.inplanes),
+            self.node())
         self.maxpool = nn.MaxPool2d(kernel_size=3, stride=2, padding=1)
-        self.layer1 = self._make_layer(block, 128, layers[0], cnf=cnf, node=self.node, **kwargs)
+        self.layer1 = self._make_layer(block, 128, layers[0], cnf=cnf, **kwargs)
         self.layer2 = self._make_layer(block, 256, layers[1], stride=2,
-                                       dilate=replace_stride_with_dilation[0], cnf=cnf, node=self.node, **kwargs)
+                                       dilate=self.replace_stride_with_dilation[0], cnf=cnf, **kwargs)
         self.layer3 = self._make_layer(block, 512, layers[2], stride=2,
-                                       dilate=replace_stride_with_dilation[1], cnf=cnf, node=self.node, **kwargs)
+                                       dilate=self.replace_stride_with_dilation[1], cnf=cnf, **kwargs)
  
         self.avgpool = nn.AdaptiveAvgPool2d((1, 1))
         self.fc = nn.Linear(512 * block.expansion, num_classes)
 
-        for m in self.modules():
-            if isinstance(m, nn.Conv2d):
-                nn.init.kaiming_normal_(m.weight, mode='fan_out', nonlinearity='relu')
-            elif isinstance(m, (nn.BatchNorm2d, nn.GroupNorm)):
-                nn.init.constant_(m.weight, 1)
-                nn.init.constant_(m.bias, 0)
-
-        # Zero-initialize the last BN in each residual branch,
-        # so that the residual branch starts with zeros, and each residual block behaves like an identity.
-        # This improves the model by 0.2~0.3% according to https://arxiv.org/abs/1706.02677
-        if zero_init_residual:
-            for m in self.modules():
-                if isinstance(m, Bottleneck):
-                    nn.init.constant_(m.bn3.weight, 0)
-                elif isinstance(m, BasicBlock):
-                    nn.init.constant_(m.bn2.weight, 0)
-
-    def _make_layer(self, block, planes, blocks, stride=1, dilate=False, cnf: str=None, node: callable = None, **kwargs):
-        norm_layer = self._norm_layer
-        downsample = None
-        previous_dilation = self.dilation
-        if dilate:
-            self.dilation *= stride
-            stride = 1
-        if stride != 1 or self.inplanes != planes * block.expansion:
-            downsample = nn.Sequential(
-                conv1x1(self.inplanes, planes * block.expansion, stride),
-                norm_layer(planes * block.expansion),
-            )
-
-        layers = []
-        layers.append(block(self.inplanes, planes, stride, downsample, self.groups,
-                            self.base_width, previous_dilation, norm_layer, cnf, node, **kwargs))
-        self.inplanes = planes * block.expansion
-        for _ in range(1, blocks):
-            layers.append(block(self.inplanes, planes, groups=self.groups,
-                                base_width=self.base_width, dilation=self.dilation,
-                                norm_layer=norm_layer, cnf=cnf, node=node, **kwargs))
-
-        return nn.Sequential(*layers)
+        self._init_weights(zero_init_residual)
 
     def _forward_impl(self, inputs):
         # See note [TorchScript super()]
         inputs = self.encoder(inputs)
         self.reset()
 
-        if self.layer_by_layer:
+        if self.stateless_backbone and not self.layer_by_layer:
+            # No module keeps cross-timestep state, so fold the time axis into
+            # batch and run the whole window as a single forward.
+            inputs = rearrange(inputs, 't b c h w -> (t b) c h w')
 
-            x = self.conv1(inputs)
-            
-            x = self.bn1(x)
-            x = self.node1(x)
+        if self.layer_by_layer or self.stateless_backbone:
 
-            x = self.layer1(x)
-            x = self.layer2(x)
-            x = self.layer3(x)
+            if self.channels_last:
+                inputs = inputs.contiguous(memory_format=torch.channels_last)
+            x = self.stem(inputs)
 
-            x = self.avgpool(x)
+            x = self._run_layer(self.layer1, x)
+            x = self._run_layer(self.layer2, x)
+            x = self._run_layer(self.layer3, x)
 
-            x = torch.flatten(x, 1)
+            # spatial mean == 1x1 adaptive avg-pool + flatten, in one kernel
+            x = x.mean(dim=(-2, -1))
 
             
             x = self.fc(x)
             
-            x = rearrange(x, '(t b) c -> t b c', t=self.step)
+            # equivalent to rearrange('(t b) c -> t b c') on the row-major fc
+            # output, without the per-call pattern parse or a contiguous copy
+            x = x.view(self.step, -1, x.size(-1))
             #print(x)
             if self.sum_output:x=x.mean(0)
  
@@ -625,217 +851,385 @@ class SEWResNetCifar(BaseModule):
 
         else:
             outputs=[]
+            acc = None
             for t in range(self.step):
                 x = inputs[t]
-                x = self.conv1(x)
-                x = self.bn1(x)
-                x = self.node1(x)
+                if self.channels_last:
+                    x = x.contiguous(memory_format=torch.channels_last)
+                x = self.stem(x)
 
-                x = self.layer1(x)
-                x = self.layer2(x)
-                x = self.layer3(x)
+                x = self._run_layer(self.layer1, x)
+                x = self._run_layer(self.layer2, x)
+                x = self._run_layer(self.layer3, x)
 
-                x = self.avgpool(x)
-                x = torch.flatten(x, 1)
+                x = x.mean(dim=(-2, -1))
                 
                 
                 x = self.fc(x)
 
-                outputs.append(x)
-            if not self.sum_output:return outputs
-            return sum(outputs) / len(outputs)
+                if self.sum_output:
+                    # running in-place accumulation keeps the tail at O(B x C)
+                    # memory instead of retaining all T output tensors
+                    acc = x if acc is None else acc.add_(x)
+                else:
+                    outputs.append(x)
+            if not self.sum_output:
+                # stacked (t, b, c) tensor: scriptable, matches the
+                # layer-by-layer branch, and avoids Python list returns
+                return torch.stack(outputs, 0)
+            return acc.div_(self.step)
 
     def _forward_once(self,x):
         # inputs = self.encoder(inputs)
         # x = inputs[t]
-        x = self.conv1(x)
-        x = self.bn1(x)
-        x = self.node1(x)
-        x = self.maxpool(x)
-
-        x = self.layer1(x)
-        x = self.layer2(x)
-        x = self.layer3(x)
-        x = self.layer4(x)
-
-        x = self.avgpool(x)
-        x = torch.flatten(x, 1)
+        if self.channels_last:
+            x = x.contiguous(memory_format=torch.channels_last)
+        x = self.stem(x)
+
+        x = self._run_layer(self.layer1, x)
+        x = self._run_layer(self.layer2, x)
+        x = self._run_layer(self.layer3, x)
+        x = self._run_layer(self.layer4, x)
+
+        x = x.mean(dim=(-2, -1))
         
         
         x = self.fc(x)
         return x
-    def forward(self, x):
-        if self.once:return self._forward_once(x)
-        return self._forward_impl(x)
 
 
-def _sew_resnet(arch, block, layers, pretrained, progress, cnf,  **kwargs):
-    model = SEWResNet(block, layers, cnf=cnf,  **kwargs)
-    if pretrained:
-        state_dict = load_state_dict_from_url(model_urls[arch],
-                                              progress=progress)
-        model.load_state_dict(state_dict)
-    return model
 
-@register_model
-def sew_resnet19(pretrained=False, progress=True, cnf: str = None,  **kwargs):
+class MultiStep(nn.Module):
     """
-    :param pretrained: If True, the SNN will load parameters from the ANN pre-trained on ImageNet
-    :type pretrained: bool
-    :param progress: If True, displays a progress bar of the download to stderr
-    :type progress: bool
-    :param cnf: the name of spike-element-wise function
-    :type cnf: str
-    :param node: a spiking neuron layer
-    :type node: callable
-    :param kwargs: kwargs for `node`
-    :type kwargs: dict
-    :return: Spiking ResNet-18
-    :rtype: torch.nn.Module
-    The spike-element-wise ResNet-18 `"Deep Residual Learning in Spiking Neural Networks" <https://arxiv.org/abs/2102.04159>`_ modified by the ResNet-18 model from `"Deep Residual Learning for Image Recognition" <https://arxiv.org/pdf/1512.03385.pdf>`_
+    Batch the T-timestep unroll into a single forward: the wrapped model's
+    backbone runs once on a ``(T*B, C, H, W)`` tensor instead of T times on
+    ``(B, C, H, W)``, so T-step inference pays the kernel-launch overhead of
+    one step. Neuron state then accumulates over the flattened batch rather
+    than per timestep, so this fits the same rate-coded regime as
+    ``stateless_backbone``
+    :param model: a SEW model
+    :param T: expected timestep count; checked against the input when set
     """
 
-    return SEWResNet19( BasicBlock, [3,3, 2],  cnf=cnf, **kwargs)
- 
-@register_model
-def sew_resnet18(pretrained=False, progress=True, cnf: str = None,  **kwargs):
-    """
-    :param pretrained: If True, the SNN will load parameters from the ANN pre-trained on ImageNet
-    :type pretrained: bool
-    :param progress: If True, displays a progress bar of the download to stderr
-    :type progress: bool
-    :param cnf: the name of spike-element-wise function
-    :type cnf: str
-    :param node: a spiking neuron layer
-    :type node: callable
-    :param kwargs: kwargs for `node`
-    :type kwargs: dict
-    :return: Spiking ResNet-18
-    :rtype: torch.nn.Module
-    The spike-element-wise ResNet-18 `"Deep Residual Learning in Spiking Neural Networks" <https://arxiv.org/abs/2102.04159>`_ modified by the ResNet-18 model from `"Deep Residual Learning for Image Recognition" <https://arxiv.org/pdf/1512.03385.pdf>`_
-    """
+    def __init__(self, model, T=None):
+        super().__init__()
+        self.model = model
+        self.T = T
 
-    return _sew_resnet('resnet18', BasicBlock, [2, 2, 2, 2], pretrained, progress, cnf, **kwargs)
+    def forward(self, x):
+        # x: [T, B, C, H, W]
+        t = x.size(0)
+        if self.T is not None and t != self.T:
+            raise ValueError('expected {} timesteps, got {}'.format(self.T, t))
+        self.model.reset()
+        amp_dtype = getattr(self.model, 'amp_dtype', None)
+        if amp_dtype is not None:
+            # the wrapper bypasses _SEWResNetBase.forward, so its autocast
+            # region has to be re-established here
+            with torch.autocast(device_type=x.device.type, dtype=amp_dtype):
+                out = self.model._forward_once(x.flatten(0, 1))
+        else:
+            out = self.model._forward_once(x.flatten(0, 1))
+        out = out.view(t, -1, out.size(-1))
+        if getattr(self.model, 'sum_output', True):
+            out = out.mean(0)
+        return out
 
-@register_model
-def sew_resnet20(pretrained=False, progress=True, cnf: str = None,  **kwargs):
-    """
-    :param pretrained: If True, the SNN will load parameters from the ANN pre-trained on ImageNet
-    :type pretrained: bool
-    :param progress: If True, displays a progress bar of the download to stderr
-    :type progress: bool
-    :param cnf: the name of spike-element-wise function
-    :type cnf: str
-    :param node: a spiking neuron layer
-    :type node: callable
-    :param kwargs: kwargs for `node`
-    :type kwargs: dict
-    :return: Spiking ResNet-34
-    :rtype: torch.nn.Module
-    The spike-element-wise ResNet-34 `"Deep Residual Learning in Spiking Neural Networks" <https://arxiv.org/abs/2102.04159>`_
-    modified by the ResNet-34 model from `"Deep Residual Learning for Image Recognition" <https://arxiv.org/pdf/1512.03385.pdf>`_
-    """
-    return SEWResNetCifar(  BasicBlock, [3,3,3],  cnf=cnf,  **kwargs)
-@register_model
-def sew_resnet32(pretrained=False, progress=True, cnf: str = None,  **kwargs):
+
+class _StaticShape(nn.Module):
     """
-    :param pretrained: If True, the SNN will load parameters from the ANN pre-trained on ImageNet
-    :type pretrained: bool
-    :param progress: If True, displays a progress bar of the download to stderr
-    :type progress: bool
-    :param cnf: the name of spike-element-wise function
-    :type cnf: str
-    :param node: a spiking neuron layer
-    :type node: callable
-    :param kwargs: kwargs for `node`
-    :type kwargs: dict
-    :return: Spiking ResNet-34
-    :rtype: torch.nn.Module
-    The spike-element-wise ResNet-34 `"Deep Residual Learning in Spiking Neural Networks" <https://arxiv.org/abs/2102.04159>`_
-    modified by the ResNet-34 model from `"Deep Residual Learning for Image Recognition" <https://arxiv.org/pdf/1512.03385.pdf>`_
+    Pin a (possibly compiled) model to a single input shape. Mismatching
+    calls raise immediately instead of silently triggering a multi-second
+    Dynamo recompile mid-training, and conforming inputs are marked static
+    so the compiled artifact keeps a single specialized graph
+    :param model: the wrapped model
+    :param shape: the only input shape the model may be called with
     """
-    return SEWResNetCifar(  BasicBlock, [5,5,5],  cnf=cnf,  **kwargs)
-@register_model
-def sew_resnet44(pretrained=False, progress=True, cnf: str = None,  **kwargs):
+
+    def __init__(self, model, shape):
+        super().__init__()
+        self.model = model
+        self.shape = tuple(shape)
+        try:
+            # one shape, one graph: never let Dynamo speculate a dynamic dim
+            torch._dynamo.config.automatic_dynamic_shapes = False
+        except AttributeError:
+            pass
+
+    def forward(self, x):
+        if tuple(x.shape) != self.shape:
+            raise ValueError(
+                'model was built for static input shape {}, got {}; rebuild '
+                'with a matching static_shape instead of recompiling'.format(
+                    self.shape, tuple(x.shape)))
+        if hasattr(torch._dynamo, 'mark_static'):
+            torch._dynamo.mark_static(x)
+        return self.model(x)
+
+
+class _CUDAGraphRunner:
     """
-    :param pretrained: If True, the SNN will load parameters from the ANN pre-trained on ImageNet
-    :type pretrained: bool
-    :param progress: If True, displays a progress bar of the download to stderr
-    :type progress: bool
-    :param cnf: the name of spike-element-wise function
-    :type cnf: str
-    :param node: a spiking neuron layer
-    :type node: callable
-    :param kwargs: kwargs for `node`
-    :type kwargs: dict
-    :return: Spiking ResNet-34
-    :rtype: torch.nn.Module
-    The spike-element-wise ResNet-34 `"Deep Residual Learning in Spiking Neural Networks" <https://arxiv.org/abs/2102.04159>`_
-    modified by the ResNet-34 model from `"Deep Residual Learning for Image Recognition" <https://arxiv.org/pdf/1512.03385.pdf>`_
+    Replays a captured CUDA Graph: copies the input into the static capture
+    buffer, replays, and clones the static output
     """
-    return SEWResNetCifar(  BasicBlock, [7,7,7],  cnf=cnf,  **kwargs)
-@register_model
-def sew_resnet56(pretrained=False, progress=True, cnf: str = None,  **kwargs):
+
+    def __init__(self, graph, static_in, static_out):
+        self.graph = graph
+        self.static_in = static_in
+        self.static_out = static_out
+
+    def run(self, x):
+        self.static_in.copy_(x)
+        self.graph.replay()
+        return self.static_out.clone()
+
+    __call__ = run
+
+
+def build_sew_graph_runner(model, sample_input, warmup=3):
     """
-    :param pretrained: If True, the SNN will load parameters from the ANN pre-trained on ImageNet
-    :type pretrained: bool
-    :param progress: If True, displays a progress bar of the download to stderr
-    :type progress: bool
-    :param cnf: the name of spike-element-wise function
-    :type cnf: str
-    :param node: a spiking neuron layer
-    :type node: callable
-    :param kwargs: kwargs for `node`
-    :type kwargs: dict
-    :return: Spiking ResNet-34
-    :rtype: torch.nn.Module
-    The spike-element-wise ResNet-34 `"Deep Residual Learning in Spiking Neural Networks" <https://arxiv.org/abs/2102.04159>`_
-    modified by the ResNet-34 model from `"Deep Residual Learning for Image Recognition" <https://arxiv.org/pdf/1512.03385.pdf>`_
+    Capture one full inference of ``model`` (including its internal T-step
+    unroll, whose control flow and shapes are fixed) into a single CUDA Graph
+    and return a runner whose ``run(x)`` replays it, eliminating per-op launch
+    overhead for small-batch multi-step inference
+    :param model: a SEW model already on the GPU, will be put in eval mode
+    :param sample_input: a CUDA tensor with the exact inference shape/dtype
+    :param warmup: eager warm-up iterations before capture so cuDNN autotunes
+    :return: a callable runner with ``run(x)``
     """
-    return SEWResNetCifar(  BasicBlock, [9,9,9],  cnf=cnf,  **kwargs)
-@register_model
-def sew_resnet34(pretrained=False, progress=True, cnf: str = None,  **kwargs):
+    assert sample_input.is_cuda, 'CUDA Graph capture requires a CUDA input'
+    model.eval()
+    with torch.no_grad():
+        for _ in range(warmup):
+            model(sample_input)
+        torch.cuda.synchronize()
+        static_in = sample_input.clone()
+        static_out = torch.empty_like(model(static_in))
+        graph = torch.cuda.CUDAGraph()
+        with torch.cuda.graph(graph):
+            static_out.copy_(model(static_in))
+    return _CUDAGraphRunner(graph, static_in, static_out)
+
+
+# cache=True memoizes fully constructed models (and downloaded checkpoints) on
+# their argument tuple; hits return a deepcopy, skipping the weight-init RNG
+# loop and the checkpoint deserialization. Deliberately opt-in: cached copies
+# share initial weights, which is wrong for seeded runs and ensembles.
+# _COMPILE_CACHE (also gated on cache=True) goes further: hits alias the
+# same compiled module and its parameters, reusing the Inductor artifact.
+_MODEL_CACHE = {}
+_STATE_DICT_CACHE = {}
+_COMPILE_CACHE = {}
+
+
+def _load_pretrained_state_dict(arch, progress):
     """
-    :param pretrained: If True, the SNN will load parameters from the ANN pre-trained on ImageNet
-    :type pretrained: bool
-    :param progress: If True, displays a progress bar of the download to stderr
-    :type progress: bool
-    :param cnf: the name of spike-element-wise function
-    :type cnf: str
-    :param node: a spiking neuron layer
-    :type node: callable
-    :param kwargs: kwargs for `node`
-    :type kwargs: dict
-    :return: Spiking ResNet-34
-    :rtype: torch.nn.Module
-    The spike-element-wise ResNet-34 `"Deep Residual Learning in Spiking Neural Networks" <https://arxiv.org/abs/2102.04159>`_
-    modified by the ResNet-34 model from `"Deep Residual Learning for Image Recognition" <https://arxiv.org/pdf/1512.03385.pdf>`_
+    Fetch the ANN checkpoint for ``arch`` into the torch.hub cache and
+    deserialize it with ``mmap=True``, so the tensors are backed by the
+    on-disk file pages instead of a checkpoint-sized CPU copy. Falls back
+    to :func:`load_state_dict_from_url` on builds without mmap support.
+    :param arch: architecture key into ``model_urls``
+    :param progress: If True, displays a download progress bar
+    :return: the pretrained state dict
     """
-    return _sew_resnet('resnet34', BasicBlock, [3, 4, 6, 3], pretrained, progress, cnf,  **kwargs)
+    try:
+        url = model_urls[arch]
+        cache_dir = os.path.join(torch.hub.get_dir(), 'checkpoints')
+        os.makedirs(cache_dir, exist_ok=True)
+        cached = os.path.join(cache_dir, url.split('/')[-1])
+        if not os.path.exists(cached):
+            torch.hub.download_url_to_file(url, cached, progress=progress)
+        return torch.load(cached, map_location='cpu', mmap=True,
+                          weights_only=True)
+    except (TypeError, RuntimeError, AttributeError):
+        # torch.load without mmap/weights_only, or a legacy checkpoint format
+        return load_state_dict_from_url(model_urls[arch], progress=progress)
 
-@register_model
-def sew_resnet50(pretrained=False, progress=True, cnf: str = None,  **kwargs):
-    """
-    :param pretrained: If True, the SNN will load parameters from the ANN pre-trained on ImageNet
-    :type pretrained: bool
-    :param progress: If True, displays a progress bar of the download to stderr
-    :type progress: bool
-    :param cnf: the name of spike-element-wise function
-    :type cnf: str
-    :param node: a spiking neuron layer
-    :type node: callable
-    :param kwargs: kwargs for `node`
-    :type kwargs: dict
-    :return: Spiking ResNet-50
-    :rtype: torch.nn.Module
-    The spike-element-wise ResNet-50 `"Deep Residual Learning in Spiking Neural Networks" <https://arxiv.org/abs/2102.04159>`_
-    modified by the ResNet-50 model from `"Deep Residual Learning for Image Recognition" <https://arxiv.org/pdf/1512.03385.pdf>`_
-    """
-    return _sew_resnet('resnet50', Bottleneck, [3, 4, 6, 3], pretrained, progress, cnf, **kwargs)
 
-@register_model
-def sew_resnet101(pretrained=False, progress=True, cnf: str = None,  **kwargs):
-    """
+def _sew_resnet(arch, block, layers, pretrained, progress, cnf,  **kwargs):
+    # snapshot the full option set before anything is popped below, so the
+    # caches key on every behavior-affecting option instead of the leftovers
+    try:
+        _options_key = frozenset(kwargs.items())
+    except TypeError:
+        # unhashable option values (e.g. a prune_profile dict): no caching
+        _options_key = None
+    compile_model = kwargs.pop('compile', False)
+    compile_mode = kwargs.pop('compile_mode', 'reduce-overhead')
+    cache = kwargs.pop('cache', False)
+    # consumed by _SEWResNetBase itself; kept here so the conversion can be
+    # re-applied after a pretrained load replaces the parameter tensors
+    channels_last = kwargs.get('channels_last', False)
+    quantize = kwargs.pop('quantize', 'none')
+    aot_path = kwargs.pop('aot_path', None)
+    example_input = kwargs.pop('example_input', None)
+    fuse_bn = kwargs.pop('fuse_bn', False)
+    inference_only = kwargs.pop('inference_only', False)
+    tune_cudnn = kwargs.pop('tune_cudnn', None)
+    allow_tf32 = kwargs.pop('allow_tf32', False)
+    warmup_input = kwargs.pop('warmup_input', None)
+    device = kwargs.pop('device', None)
+    shape_hint = kwargs.pop('shape_hint', None)
+    static_shape = kwargs.pop('static_shape', None)
+    prune_profile = kwargs.pop('prune_profile', None)
+    multi_step = kwargs.pop('multi_step', False)
+    multi_step_T = kwargs.pop('T', None)
+    if torch.cuda.is_available():
+        # both switches are process-global, so they are opt-in only and are
+        # never written back to False for models built elsewhere
+        if tune_cudnn or (tune_cudnn is None and kwargs.get('groups', 1) > 1):
+            # the SEW unroll hits the same conv shapes every timestep, so
+            # autotuning pays off; grouped 3x3 convs (the ResNeXt variants)
+            # fall back to a slow generic kernel without it and opt in by
+            # default, pass tune_cudnn=False to leave the flag untouched
+            torch.backends.cudnn.benchmark = True
+        if allow_tf32:
+            # TF32 changes numerics process-wide, so it is strictly opt-in
+            torch.backends.cuda.matmul.allow_tf32 = True
+            torch.backends.cudnn.allow_tf32 = True
+    compile_key = None
+    if cache and compile_model and shape_hint is not None and _options_key is not None:
+        # _options_key covers shape_hint and step, so the key pins both the
+        # input shape and the unroll length the graph is specialized for.
+        # Unlike _MODEL_CACHE, hits alias the very same module (a compiled
+        # module cannot be deepcopied), so this path additionally requires
+        # the explicit cache=True opt-in: independent constructions must
+        # never end up training one shared set of weights by surprise
+        compile_key = (arch, tuple(layers), pretrained, cnf, _options_key)
+        if compile_key in _COMPILE_CACHE:
+            compiled = _COMPILE_CACHE[compile_key]
+            if static_shape is not None:
+                compiled = _StaticShape(compiled, static_shape)
+            return compiled
+        try:
+            # persist Inductor artifacts across processes too, so sweeps that
+            # respawn workers do not repay the compile per process
+            torch._inductor.config.fx_graph_cache = True
+        except (AttributeError, ImportError):
+            pass
+    cache_key = None
+    if cache and _options_key is not None:
+        cache_key = (arch, block, tuple(layers), pretrained, cnf, _options_key)
+    model = None
+    if cache_key is not None and cache_key in _MODEL_CACHE:
+        # the cached copy already carries every build-time option (pretrained
+        # weights, pruning, BN folding, quantization, MultiStep, device); the
+        # per-instance steps below re-run on it like on a fresh build
+        model = deepcopy(_MODEL_CACHE[cache_key])
+    if model is None:
+        if device is not None:
+            # allocate parameters directly on the target device, so the weight
+            # init in _init_weights samples there (cuRAND on GPU) instead of on
+            # CPU followed by a full host-to-device copy of the model
+            with torch.device(device):
+                model = SEWResNet(block, layers, cnf=cnf,  **kwargs)
+        else:
+            model = SEWResNet(block, layers, cnf=cnf,  **kwargs)
+        if pretrained:
+            state_dict_cached = cache and arch in _STATE_DICT_CACHE
+            if state_dict_cached:
+                state_dict = _STATE_DICT_CACHE[arch]
+            else:
+                state_dict = _load_pretrained_state_dict(arch, progress)
+                if cache:
+                    _STATE_DICT_CACHE[arch] = state_dict
+            # torchvision checkpoints name the stem conv1/bn1, ours lives in stem.*
+            remapped = {}
+            for k, v in state_dict.items():
+                if k.startswith('conv1.'):
+                    k = 'stem.conv.' + k[len('conv1.'):]
+                elif k.startswith('bn1.'):
+                    k = 'stem.bn.' + k[len('bn1.'):]
+                remapped[k] = v
+            if state_dict_cached:
+                # copy out of the cached dict: adopting its tensors via
+                # assign=True would make every cached build share parameter
+                # storage, so training one would corrupt them all
+                model.load_state_dict(remapped)
+            else:
+                try:
+                    # assign=True adopts the mmap-backed tensors directly
+                    # instead of copying them into the freshly initialized
+                    # parameters
+                    model.load_state_dict(remapped, assign=True)
+                except TypeError:
+                    model.load_state_dict(remapped)
+            if device is not None:
+                # the assign-load adopted CPU checkpoint tensors while the
+                # rest of the model lives on the build device; move the
+                # loaded parameters over in one transfer, overlapping the
+                # host-to-device copy with the mmap page-in
+                model.to(device, non_blocking=True)
+            if channels_last:
+                model.to(memory_format=torch.channels_last)
+        if prune_profile is not None:
+            model = _prune_zero_spike_channels(model, prune_profile)
+        if fuse_bn:
+            # inference build: fold BN into the convs (using the just-loaded
+            # running statistics) before any quantization/compilation below
+            model.eval()
+            model.fuse_model()
+        model = _quantize_model(model, quantize)
+        if multi_step:
+            model = MultiStep(model, T=multi_step_T)
+        if aot_path is not None:
+            # pay the Inductor compile once offline; inference servers reload the
+            # fused kernels from disk via torch._export.aot_load, skipping the
+            # per-process Dynamo warm-up entirely. SEW input shapes are fixed
+            # (e.g. 3x32x32 or 3x224x224), so static-shape AOT is appropriate.
+            if example_input is None:
+                raise ValueError('aot_path requires example_input to specialize shapes')
+            try:
+                from torch._export import aot_compile
+            except ImportError:
+                raise NotImplementedError('AOT export needs a PyTorch build with torch._export.aot_compile')
+            aot_compile(model, (example_input,),
+                        options={'aot_inductor.output_path': aot_path})
+        if cache_key is not None:
+            _MODEL_CACHE[cache_key] = deepcopy(model)
+    if inference_only:
+        # freeze parameters and run under inference_mode: no saved-for-backward
+        # on the SEW merges and no version-counter bumps on in-place node
+        # updates, which also unblocks CUDA Graph capture
+        for param in model.parameters():
+            param.requires_grad_(False)
+        forward = model.forward
+
+        @functools.wraps(forward)
+        def _inference_forward(x):
+            with torch.inference_mode():
+                return forward(x)
+
+        model.forward = _inference_forward
+    if warmup_input is not None:
+        # throwaway forwards let cuDNN benchmark every conv shape (most
+        # valuable for the grouped ResNeXt kernels) before timing starts
+        was_training = model.training
+        model.eval()
+        with torch.no_grad():
+            for _ in range(2):
+                model(warmup_input)
+        model.train(was_training)
+    compiled = _maybe_compile(model, compile_model, compile_mode)
+    if compile_key is not None:
+        # trigger the Inductor compile on the hinted shape now, then reuse
+        # the specialized module on later identically-keyed factory calls;
+        # eval() keeps the zeros batch out of the BN running statistics
+        was_training = model.training
+        model.eval()
+        with torch.no_grad():
+            compiled(torch.zeros(*shape_hint, device=device))
+        model.train(was_training)
+        if hasattr(model, 'reset'):
+            model.reset()
+        _COMPILE_CACHE[compile_key] = compiled
+    if static_shape is not None:
+        compiled = _StaticShape(compiled, static_shape)
+    return compiled
+
+# shared docstring for every sew factory: one template interpolated per
+# variant instead of a ~15-line literal duplicated in each function
+_DOC_TEMPLATE = """
     :param pretrained: If True, the SNN will load parameters from the ANN pre-trained on ImageNet
     :type pretrained: bool
     :param progress: If True, displays a progress bar of the download to stderr
@@ -846,143 +1240,106 @@ def sew_resnet101(pretrained=False, progress=True, cnf: str = None,  **kwargs):
     :type node: callable
     :param kwargs: kwargs for `node`
     :type kwargs: dict
-    :return: Spiking ResNet-101
+    :return: Spiking {arch}
     :rtype: torch.nn.Module
-    The spike-element-wise ResNet-101 `"Deep Residual Learning in Spiking Neural Networks" <https://arxiv.org/abs/2102.04159>`_
-    modified by the ResNet-101 model from `"Deep Residual Learning for Image Recognition" <https://arxiv.org/pdf/1512.03385.pdf>`_
+    The spike-element-wise {arch} `"Deep Residual Learning in Spiking Neural Networks" <https://arxiv.org/abs/2102.04159>`_
+    modified by the {arch} model from {ref}{note}
     """
-    return _sew_resnet('resnet101', Bottleneck, [3, 4, 23, 3], pretrained, progress, cnf, **kwargs)
 
-@register_model
-def sew_resnet152(pretrained=False, progress=True, cnf: str = None,  **kwargs):
-    """
-    :param pretrained: If True, the SNN will load parameters from the ANN pre-trained on ImageNet
-    :type pretrained: bool
-    :param progress: If True, displays a progress bar of the download to stderr
-    :type progress: bool
-    :param cnf: the name of spike-element-wise function
-    :type cnf: str
-    :param node: a single step neuron
-    :type node: callable
-    :param kwargs: kwargs for `node`
-    :type kwargs: dict
-    :return: Spiking ResNet-152
-    :rtype: torch.nn.Module
-    The spike-element-wise ResNet-152 `"Deep Residual Learning in Spiking Neural Networks" <https://arxiv.org/abs/2102.04159>`_
-    modified by the ResNet-152 model from `"Deep Residual Learning for Image Recognition" <https://arxiv.org/pdf/1512.03385.pdf>`_
-    """
-    return _sew_resnet('resnet152', Bottleneck, [3, 8, 36, 3], pretrained, progress, cnf,  **kwargs)
+# per-family reference links and notes interpolated into _DOC_TEMPLATE
+_RESNET_REF = '`"Deep Residual Learning for Image Recognition" <https://arxiv.org/pdf/1512.03385.pdf>`_'
+_RESNEXT_REF = '`"Aggregated Residual Transformation for Deep Neural Networks" <https://arxiv.org/pdf/1611.05431.pdf>`_'
+_WIDE_RESNET_REF = '`"Wide Residual Networks" <https://arxiv.org/pdf/1605.07146.pdf>`_'
+_WIDE_RESNET_NOTE = (
+    '\n    The model is the same as ResNet except for the bottleneck number of channels'
+    '\n    which is twice larger in every block. The number of channels in outer 1x1'
+    '\n    convolutions is the same, e.g. last block in ResNet-50 has 2048-512-2048'
+    '\n    channels, and in Wide ResNet-50-2 has 2048-1024-2048.')
 
-@register_model
-def sew_resnext50_32x4d(pretrained=False, progress=True, cnf: str = None, **kwargs):
-    """
-    :param pretrained: If True, the SNN will load parameters from the ANN pre-trained on ImageNet
-    :type pretrained: bool
-    :param progress: If True, displays a progress bar of the download to stderr
-    :type progress: bool
-    :param cnf: the name of spike-element-wise function
-    :type cnf: str
-    :param node: a single step neuron
-    :type node: callable
-    :param kwargs: kwargs for `node`
-    :type kwargs: dict
-    :return: Spiking ResNeXt-50 32x4d
-    :rtype: torch.nn.Module
-    The spike-element-wise ResNeXt-50 32x4d `"Deep Residual Learning in Spiking Neural Networks" <https://arxiv.org/abs/2102.04159>`_
-    modified by the ResNeXt-50 32x4d model from `"Aggregated Residual Transformation for Deep Neural Networks" <https://arxiv.org/pdf/1611.05431.pdf>`_
-    """
-    kwargs['groups'] = 32
-    kwargs['width_per_group'] = 4
-    return _sew_resnet('resnext50_32x4d', Bottleneck, [3, 4, 6, 3], pretrained, progress, cnf,  **kwargs)
 
 @register_model
-def sew_resnext34_32x4d(pretrained=False, progress=True, cnf: str = None,   **kwargs):
-    """
-    :param pretrained: If True, the SNN will load parameters from the ANN pre-trained on ImageNet
-    :type pretrained: bool
-    :param progress: If True, displays a progress bar of the download to stderr
-    :type progress: bool
-    :param cnf: the name of spike-element-wise function
-    :type cnf: str
-    :param node: a single step neuron
-    :type node: callable
-    :param kwargs: kwargs for `node`
-    :type kwargs: dict
-    :return: Spiking ResNeXt-101 32x8d
-    :rtype: torch.nn.Module
-    The spike-element-wise ResNeXt-101 32x8d `"Deep Residual Learning in Spiking Neural Networks" <https://arxiv.org/abs/2102.04159>`_ modified by the ResNeXt-101 32x8d model from `"Aggregated Residual Transformation for Deep Neural Networks" <https://arxiv.org/pdf/1611.05431.pdf>`_
-    """
-    kwargs['groups'] = 32
-    kwargs['width_per_group'] = 4
-    return _sew_resnet('resnext34_32x4d', BasicBlock, [3, 4, 6, 3], pretrained, progress, cnf,   **kwargs)
+def sew_resnet19(pretrained=False, progress=True, cnf: str = None,  **kwargs):
+    compile_model = kwargs.pop('compile', False)
+    compile_mode = kwargs.pop('compile_mode', 'reduce-overhead')
+    return _maybe_compile(SEWResNet19( BasicBlock, [3,3, 2],  cnf=cnf, **kwargs), compile_model, compile_mode)
+ 
 
 @register_model
-def sew_resnext101_32x8d(pretrained=False, progress=True, cnf: str = None, node: callable=None, **kwargs):
-    """
-    :param pretrained: If True, the SNN will load parameters from the ANN pre-trained on ImageNet
-    :type pretrained: bool
-    :param progress: If True, displays a progress bar of the download to stderr
-    :type progress: bool
-    :param cnf: the name of spike-element-wise function
-    :type cnf: str
-    :param node: a single step neuron
-    :type node: callable
-    :param kwargs: kwargs for `node`
-    :type kwargs: dict
-    :return: Spiking ResNeXt-101 32x8d
-    :rtype: torch.nn.Module
-    The spike-element-wise ResNeXt-101 32x8d `"Deep Residual Learning in Spiking Neural Networks" <https://arxiv.org/abs/2102.04159>`_ modified by the ResNeXt-101 32x8d model from `"Aggregated Residual Transformation for Deep Neural Networks" <https://arxiv.org/pdf/1611.05431.pdf>`_
-    """
-    kwargs['groups'] = 32
-    kwargs['width_per_group'] = 8
-    return _sew_resnet('resnext101_32x8d', Bottleneck, [3, 4, 23, 3], pretrained, progress, cnf, node, **kwargs)
-
+def sew_resnet20(pretrained=False, progress=True, cnf: str = None,  **kwargs):
+    compile_model = kwargs.pop('compile', False)
+    compile_mode = kwargs.pop('compile_mode', 'reduce-overhead')
+    return _maybe_compile(SEWResNetCifar(  BasicBlock, [3,3,3],  cnf=cnf,  **kwargs), compile_model, compile_mode)
 @register_model
-def sew_wide_resnet50_2(pretrained=False, progress=True, cnf: str = None,  **kwargs):
-    """
-    :param pretrained: If True, the SNN will load parameters from the ANN pre-trained on ImageNet
-    :type pretrained: bool
-    :param progress: If True, displays a progress bar of the download to stderr
-    :type progress: bool
-    :param cnf: the name of spike-element-wise function
-    :type cnf: str
-    :param node: a single step neuron
-    :type node: callable
-    :param kwargs: kwargs for `node`
-    :type kwargs: dict
-    :return: Spiking Wide ResNet-50-2
-    :rtype: torch.nn.Module
-    The spike-element-wise Wide ResNet-50-2 `"Deep Residual Learning in Spiking Neural Networks" <https://arxiv.org/abs/2102.04159>`_
-    modified by the Wide ResNet-50-2 model from `"Wide Residual Networks" <https://arxiv.org/pdf/1605.07146.pdf>`_
-    The model is the same as ResNet except for the bottleneck number of channels
-    which is twice larger in every block. The number of channels in outer 1x1
-    convolutions is the same, e.g. last block in ResNet-50 has 2048-512-2048
-    channels, and in Wide ResNet-50-2 has 2048-1024-2048.
-    """
-    kwargs['width_per_group'] = 64 * 2
-    return _sew_resnet('wide_resnet50_2', Bottleneck, [3, 4, 6, 3], pretrained, progress, cnf,  **kwargs)
-
+def sew_resnet32(pretrained=False, progress=True, cnf: str = None,  **kwargs):
+    compile_model = kwargs.pop('compile', False)
+    compile_mode = kwargs.pop('compile_mode', 'reduce-overhead')
+    return _maybe_compile(SEWResNetCifar(  BasicBlock, [5,5,5],  cnf=cnf,  **kwargs), compile_model, compile_mode)
 @register_model
-def sew_wide_resnet101_2(pretrained=False, progress=True, cnf: str = None,  **kwargs):
-    """
-    :param pretrained: If True, the SNN will load parameters from the ANN pre-trained on ImageNet
-    :type pretrained: bool
-    :param progress: If True, displays a progress bar of the download to stderr
-    :type progress: bool
-    :param cnf: the name of spike-element-wise function
-    :type cnf: str
-    :param node: a single step neuron
-    :type node: callable
-    :param kwargs: kwargs for `node`
-    :type kwargs: dict
-    :return: Spiking Wide ResNet-101-2
-    :rtype: torch.nn.Module
-    The spike-element-wise Wide ResNet-101-2 `"Deep Residual Learning in Spiking Neural Networks" <https://arxiv.org/abs/2102.04159>`_
-    modified by the Wide ResNet-101-2 model from `"Wide Residual Networks" <https://arxiv.org/pdf/1605.07146.pdf>`_
-    The model is the same as ResNet except for the bottleneck number of channels
-    which is twice larger in every block. The number of channels in outer 1x1
-    convolutions is the same, e.g. last block in ResNet-50 has 2048-512-2048
-    channels, and in Wide ResNet-50-2 has 2048-1024-2048.
-    """
-    kwargs['width_per_group'] = 64 * 2
-    return _sew_resnet('wide_resnet101_2', Bottleneck, [3, 4, 23, 3], pretrained, progress, cnf,  **kwargs)
+def sew_resnet44(pretrained=False, progress=True, cnf: str = None,  **kwargs):
+    compile_model = kwargs.pop('compile', False)
+    compile_mode = kwargs.pop('compile_mode', 'reduce-overhead')
+    return _maybe_compile(SEWResNetCifar(  BasicBlock, [7,7,7],  cnf=cnf,  **kwargs), compile_model, compile_mode)
+@register_model
+def sew_resnet56(pretrained=False, progress=True, cnf: str = None,  **kwargs):
+    compile_model = kwargs.pop('compile', False)
+    compile_mode = kwargs.pop('compile_mode', 'reduce-overhead')
+    return _maybe_compile(SEWResNetCifar(  BasicBlock, [9,9,9],  cnf=cnf,  **kwargs), compile_model, compile_mode)
+
+
+for _fn, _arch in ((sew_resnet19, 'ResNet-19'), (sew_resnet20, 'ResNet-20'),
+                   (sew_resnet32, 'ResNet-32'), (sew_resnet44, 'ResNet-44'),
+                   (sew_resnet56, 'ResNet-56')):
+    _fn.__doc__ = _DOC_TEMPLATE.format(arch=_arch, ref=_RESNET_REF, note='')
+
+
+
+
+
+
+
+# (arch, block, layers, extra kwargs, display name, reference, note) for
+# every factory that routes through _sew_resnet; the display/reference/note
+# fields feed _DOC_TEMPLATE so each variant keeps its own citation
+_SEW_CFG = {
+    'sew_resnet18': ('resnet18', BasicBlock, [2, 2, 2, 2], {},
+                     'ResNet-18', _RESNET_REF, ''),
+    'sew_resnet34': ('resnet34', BasicBlock, [3, 4, 6, 3], {},
+                     'ResNet-34', _RESNET_REF, ''),
+    'sew_resnet50': ('resnet50', Bottleneck, [3, 4, 6, 3], {},
+                     'ResNet-50', _RESNET_REF, ''),
+    'sew_resnet101': ('resnet101', Bottleneck, [3, 4, 23, 3], {},
+                      'ResNet-101', _RESNET_REF, ''),
+    'sew_resnet152': ('resnet152', Bottleneck, [3, 8, 36, 3], {},
+                      'ResNet-152', _RESNET_REF, ''),
+    'sew_resnext50_32x4d': ('resnext50_32x4d', Bottleneck, [3, 4, 6, 3],
+                            {'groups': 32, 'width_per_group': 4},
+                            'ResNeXt-50 32x4d', _RESNEXT_REF, ''),
+    'sew_resnext34_32x4d': ('resnext34_32x4d', BasicBlock, [3, 4, 6, 3],
+                            {'groups': 32, 'width_per_group': 4},
+                            'ResNeXt-34 32x4d', _RESNEXT_REF, ''),
+    'sew_resnext101_32x8d': ('resnext101_32x8d', Bottleneck, [3, 4, 23, 3],
+                             {'groups': 32, 'width_per_group': 8},
+                             'ResNeXt-101 32x8d', _RESNEXT_REF, ''),
+    'sew_wide_resnet50_2': ('wide_resnet50_2', Bottleneck, [3, 4, 6, 3],
+                            {'width_per_group': 128},
+                            'Wide ResNet-50-2', _WIDE_RESNET_REF, _WIDE_RESNET_NOTE),
+    'sew_wide_resnet101_2': ('wide_resnet101_2', Bottleneck, [3, 4, 23, 3],
+                             {'width_per_group': 128},
+                             'Wide ResNet-101-2', _WIDE_RESNET_REF, _WIDE_RESNET_NOTE),
+}
+
+
+def _make_sew_factory(fn_name, arch, block, layers, extra, doc):
+    def factory(pretrained=False, progress=True, cnf: str = None, **kwargs):
+        kwargs.update(extra)
+        return _sew_resnet(arch, block, layers, pretrained, progress, cnf, **kwargs)
+    factory.__name__ = fn_name
+    factory.__qualname__ = fn_name
+    factory.__doc__ = doc
+    return factory
+
+
+for _fn_name, (_arch, _block, _layers, _extra, _display, _ref, _note) in _SEW_CFG.items():
+    globals()[_fn_name] = register_model(_make_sew_factory(
+        _fn_name, _arch, _block, _layers, _extra,
+        _DOC_TEMPLATE.format(arch=_display, ref=_ref, note=_note)))